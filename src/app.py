@@ -1,8 +1,8 @@
 import streamlit as st
-from .audio_generator import load_model, generate_music_tensors, save_audio
+from .audio_generator import load_model, generate_music_tensors, save_audio, save_tokens
 from .visualizer import generate_video
-from .utils import get_binary_file_downloader_html
-from .config import AUDIO_FILE, VIDEO_FILE
+from .utils import get_binary_file_downloader_html, TORCH_THREADS_LOCK
+from .config import AUDIO_FILE, VIDEO_FILE, SEPARATION_STEMS
 
 
 
@@ -58,6 +58,12 @@ def main():
         )
         
         duration = st.slider("Duration (seconds)", 10, 30, 10, 1)
+
+        stem = st.selectbox(
+            "Isolate an instrument before visualizing (helps with multi-instrument music):",
+            ["Full mix"] + SEPARATION_STEMS,
+            key="stem_input"
+        )
         
         generate_button = st.button("Generate Music")
 
@@ -68,11 +74,13 @@ def main():
             
             with st.spinner("Generating Music..."):
                 model = get_model()
-                music_tensors = generate_music_tensors(text_area, model, duration)
+                with TORCH_THREADS_LOCK:
+                    music_tensors, tokens = generate_music_tensors(text_area, model, duration)
                 save_audio(music_tensors)
+                save_tokens(tokens, model)
             
             with st.spinner("Generating Video..."):
-                generate_video()
+                generate_video(None if stem == "Full mix" else stem)
 
             subheader_container.subheader("Generated Music")
     
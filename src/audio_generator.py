@@ -1,18 +1,20 @@
 import os
 import sys
+import hashlib
+import numpy as np
 import torch
 import torchaudio
 from audiocraft.models import MusicGen
-from .config import SAMPLE_RATE, AUDIO_DURATION, AUDIO_FILE
+from .config import MUSICGEN_MODEL, SAMPLE_RATE, AUDIO_DURATION, AUDIO_FILE, TOKENS_DIR
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'audiocraft'))
 
 from audiocraft.models import MusicGen
 
 def load_model():
-    return MusicGen.get_pretrained('facebook/musicgen-small')
+    return MusicGen.get_pretrained(MUSICGEN_MODEL)
 
-def generate_music_tensors(description: str, model: MusicGen, duration: int = AUDIO_DURATION) -> torch.Tensor:
+def generate_music_tensors(description: str, model: MusicGen, duration: int = AUDIO_DURATION) -> tuple:
     """
     Generates music tensors based on a given description using the specified model.
 
@@ -22,7 +24,8 @@ def generate_music_tensors(description: str, model: MusicGen, duration: int = AU
         duration (int, optional): The duration of the generated music in seconds. Defaults to AUDIO_DURATION.
 
     Returns:
-        torch.Tensor: A tensor containing the generated music samples.
+        tuple: A tensor containing the generated music samples with shape [C, T], and a tensor
+            containing the EnCodec tokens they were decoded from with shape [K, S].
     """
     model.set_generation_params(
         use_sampling=True,
@@ -30,13 +33,123 @@ def generate_music_tensors(description: str, model: MusicGen, duration: int = AU
         duration=duration
     )
 
-    output = model.generate(
+    output, tokens = model.generate(
         descriptions=[description],
         progress=True,
         return_tokens=True
     )
 
-    return output[0]
+    return output[0], tokens[0]
+
+def extend_music_tensors(tokens: torch.Tensor, description: str, model: MusicGen, duration: int = AUDIO_DURATION) -> tuple:
+    """
+    Continues a clip from its stored tokens. The tokens are used directly as the prompt,
+    so the prefix is neither regenerated nor re-encoded from audio.
+
+    The extension is generated in a single window of at most `model.max_duration` seconds,
+    so only the most recent tokens that fit next to it are used as context. Earlier tokens
+    are kept unchanged at the start of the result.
+
+    Args:
+        tokens (torch.Tensor): The EnCodec tokens of the clip to continue, with shape [K, S].
+        description (str): A textual description of the music to be generated.
+        model (MusicGen): The pre-trained MusicGen model the tokens were generated with.
+        duration (int, optional): The number of seconds to add to the clip. Defaults to AUDIO_DURATION.
+
+    Returns:
+        tuple: A tensor containing the music samples of the whole extended clip with shape [C, T],
+            and a tensor containing its tokens with shape [K, S'].
+
+    Raises:
+        ValueError: If `duration` does not leave room for any context within `model.max_duration`.
+        RuntimeError: If the installed audiocraft does not expose token-level generation.
+    """
+    # generate_continuation() only takes audio and re-encodes it with EnCodec, so the stored
+    # tokens are passed to the token-level methods it uses internally instead.
+    if not (hasattr(model, '_prepare_tokens_and_attributes') and hasattr(model, '_generate_tokens')):
+        raise RuntimeError("This audiocraft version does not support continuing from tokens")
+
+    # Work in frames: _generate_tokens truncates duration * frame_rate, and leaving one frame
+    # of margin keeps the total below max_duration so the single-window path is taken.
+    max_frames = int(model.max_duration * model.frame_rate)
+    extend_frames = int(round(duration * model.frame_rate))
+    context_frames = min(tokens.shape[-1], max_frames - 1 - extend_frames)
+    if extend_frames <= 0 or context_frames <= 0:
+        raise ValueError(f"Cannot extend by {duration}s, the model generates at most {model.max_duration}s at a time")
+
+    head_tokens = tokens[:, :tokens.shape[-1] - context_frames].long().to(model.device)
+    prompt_tokens = tokens[None, :, -context_frames:].long().to(model.device)
+
+    model.set_generation_params(
+        use_sampling=True,
+        top_k=250,
+        duration=(context_frames + extend_frames + 0.5) / model.frame_rate
+    )
+
+    attributes, _ = model._prepare_tokens_and_attributes([description], None)
+    gen_tokens = model._generate_tokens(attributes, prompt_tokens, progress=True)
+    gen_tokens = torch.cat([head_tokens, gen_tokens[0]], dim=-1)
+
+    return decode_tokens(gen_tokens, model), gen_tokens
+
+def decode_tokens(tokens: torch.Tensor, model: MusicGen) -> torch.Tensor:
+    """
+    Decodes stored EnCodec tokens back to audio.
+
+    Args:
+        tokens (torch.Tensor): The EnCodec tokens with shape [K, S].
+        model (MusicGen): The pre-trained MusicGen model the tokens were generated with.
+
+    Returns:
+        torch.Tensor: A tensor containing the decoded music samples with shape [C, T].
+    """
+    return model.generate_audio(tokens[None].long().to(model.device))[0]
+
+def save_tokens(tokens: torch.Tensor, model: MusicGen, tokens_dir: str = TOKENS_DIR) -> str:
+    """
+    Saves EnCodec tokens as a compact int16 array, together with the id of the model that
+    produced them. This is the canonical artifact of a clip: the audio can be decoded from
+    it on demand with `decode_tokens`.
+
+    Args:
+        tokens (torch.Tensor): The EnCodec tokens with shape [K, S].
+        model (MusicGen): The pre-trained MusicGen model the tokens were generated with.
+        tokens_dir (str, optional): The directory to write to. Defaults to TOKENS_DIR.
+
+    Returns:
+        str: The path of the written .npz file, named after the hash of the tokens.
+
+    Raises:
+        ValueError: If the tokens do not fit in int16.
+    """
+    codes = tokens.detach().cpu().numpy()
+    if codes.min() < 0 or codes.max() > np.iinfo(np.int16).max:
+        raise ValueError(f"Tokens out of int16 range: [{codes.min()}, {codes.max()}]")
+    codes = codes.astype(np.int16)
+
+    os.makedirs(tokens_dir, exist_ok=True)
+    tokens_file = os.path.join(tokens_dir, f"{hashlib.sha1(codes.tobytes()).hexdigest()[:16]}.npz")
+    np.savez(tokens_file, codes=codes, model=model.name, frame_rate=model.frame_rate)
+    return tokens_file
+
+def load_tokens(tokens_file: str, model: MusicGen) -> torch.Tensor:
+    """
+    Loads EnCodec tokens saved with `save_tokens`.
+
+    Args:
+        tokens_file (str): The path of the .npz file to read.
+        model (MusicGen): The pre-trained MusicGen model that will decode or extend the tokens.
+
+    Returns:
+        torch.Tensor: The EnCodec tokens with shape [K, S].
+
+    Raises:
+        ValueError: If the tokens were generated with a different model.
+    """
+    with np.load(tokens_file) as data:
+        if str(data['model']) != model.name:
+            raise ValueError(f"Tokens in {tokens_file} were generated with {data['model']}, not {model.name}")
+        return torch.from_numpy(data['codes'].astype(np.int64))
 
 def save_audio(samples: torch.Tensor):
     """
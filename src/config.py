@@ -1,6 +1,7 @@
 import os
 
 # Audio generation settings
+MUSICGEN_MODEL = 'facebook/musicgen-small'
 SAMPLE_RATE = 32000
 AUDIO_DURATION = 10  # seconds
 
@@ -14,8 +15,17 @@ NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 RESOLUTION = (1920, 1080)
 SCALE = 2
 
+# Source separation settings
+SEPARATION_MODEL = 'htdemucs'
+SEPARATION_STEMS = ['other', 'drums', 'bass', 'vocals']  # 'other' holds piano, guitar, etc.
+SEPARATION_CHUNK_SECONDS = 7.0  # only for models without a fixed training segment
+SEPARATION_OVERLAP_SECONDS = 1.0
+SEPARATION_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+
 # File paths
 AUDIO_OUTPUT_DIR = 'audio_output'
 FRAMES_DIR = os.path.join(AUDIO_OUTPUT_DIR, 'frames')
 AUDIO_FILE = os.path.join(AUDIO_OUTPUT_DIR, 'audio_0.wav')
+TOKENS_DIR = os.path.join(AUDIO_OUTPUT_DIR, 'tokens')
 VIDEO_FILE = os.path.join('media', 'movie.mp4')
+STEMS_DIR = os.path.join(AUDIO_OUTPUT_DIR, 'stems')
@@ -0,0 +1,188 @@
+import os
+import hashlib
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+import torch
+import torchaudio
+from demucs.apply import apply_model
+from demucs.audio import convert_audio
+from demucs.pretrained import get_model
+from .utils import TORCH_THREADS_LOCK
+from .config import (
+    AUDIO_FILE,
+    STEMS_DIR,
+    SEPARATION_MODEL,
+    SEPARATION_CHUNK_SECONDS,
+    SEPARATION_OVERLAP_SECONDS,
+    SEPARATION_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def load_separation_model(name: str = SEPARATION_MODEL):
+    model = get_model(name)
+    model.eval()
+    return model
+
+def audio_hash(audio_file: str) -> str:
+    """
+    Computes a content hash of an audio file, used as the key for cached stems.
+
+    Parameters:
+    audio_file (str): The path to the audio file.
+
+    Returns:
+    str: The hex digest of the file contents.
+    """
+    h = hashlib.sha1()
+    with open(audio_file, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def chunk_weights(length: int, overlap: int) -> torch.Tensor:
+    """
+    Builds the cross-fade weights for one chunk: linear ramps over the overlapping
+    edges and ones in the middle. The ramps never reach zero so every sample keeps
+    a non-zero total weight.
+
+    Parameters:
+    length (int): The number of samples in the chunk.
+    overlap (int): The number of samples shared with each neighbouring chunk.
+
+    Returns:
+    torch.Tensor: A 1D tensor of weights of size `length`.
+    """
+    weights = torch.ones(length)
+    overlap = min(overlap, length // 2)
+    if overlap > 0:
+        ramp = torch.linspace(0, 1, overlap + 2)[1:-1]
+        weights[:overlap] = ramp
+        weights[-overlap:] = ramp.flip(0)
+    return weights
+
+def separate_chunk(model, chunk: torch.Tensor, source_index: int) -> torch.Tensor:
+    """
+    Runs the separation model on a single chunk and keeps only the target source.
+
+    Parameters:
+    model: The pre-trained Demucs model.
+    chunk (torch.Tensor): The normalized mix chunk with shape [C, T].
+    source_index (int): The index of the target source in `model.sources`.
+
+    Returns:
+    torch.Tensor: The separated source with shape [C, T].
+    """
+    with torch.no_grad():
+        out = apply_model(model, chunk[None], shifts=0, split=False, progress=False, device='cpu')
+    return out[0, source_index]
+
+def separate_chunked(model, mix: torch.Tensor, source_index: int) -> torch.Tensor:
+    """
+    Separates one source from a mix by running the model on overlapping fixed-size
+    chunks in a worker pool and cross-fading the results back together.
+
+    Chunks are as long as the model's training segment, so HTDemucs does not pad them.
+    At most two chunk outputs per worker are in flight at a time and only the target
+    source is accumulated; the mix and the output are still held in full.
+
+    Parameters:
+    model: The pre-trained Demucs model.
+    mix (torch.Tensor): The normalized mix with shape [C, T] at `model.samplerate`.
+    source_index (int): The index of the target source in `model.sources`.
+
+    Returns:
+    torch.Tensor: The separated source with shape [C, T].
+    """
+    length = mix.shape[-1]
+    segment = getattr(model, 'max_allowed_segment', math.inf)
+    if math.isinf(segment):
+        segment = SEPARATION_CHUNK_SECONDS
+    chunk_size = int(segment * model.samplerate)
+    overlap = min(int(SEPARATION_OVERLAP_SECONDS * model.samplerate), chunk_size // 2)
+    stride = chunk_size - overlap
+
+    out = torch.zeros_like(mix)
+    weight_sum = torch.zeros(length)
+
+    def accumulate(future, offset):
+        separated = future.result()
+        weights = chunk_weights(separated.shape[-1], overlap)
+        out[:, offset:offset + separated.shape[-1]] += separated * weights
+        weight_sum[offset:offset + separated.shape[-1]] += weights
+
+    with ThreadPoolExecutor(max_workers=SEPARATION_WORKERS) as pool:
+        pending = {}
+        for offset in range(0, max(length - overlap, 1), stride):
+            chunk = mix[:, offset:offset + chunk_size]
+            pending[pool.submit(separate_chunk, model, chunk, source_index)] = offset
+
+            if len(pending) >= 2 * SEPARATION_WORKERS:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    accumulate(future, pending.pop(future))
+
+        for future in list(pending):
+            accumulate(future, pending.pop(future))
+
+    return out / weight_sum
+
+def separate_stem(stem: str, audio_file: str = AUDIO_FILE) -> str:
+    """
+    Isolates a single stem (e.g. 'other' for piano, or 'drums') from an audio file
+    using Demucs, so the FFT analysis is not swamped by the other instruments.
+
+    The separated stem is written to STEMS_DIR, keyed by the hash of the input audio,
+    the separation model and the stem, and reused on later calls.
+
+    Parameters:
+    stem (str): The name of the stem to isolate, one of the model's sources.
+    audio_file (str): The path to the audio file to separate. Defaults to AUDIO_FILE.
+
+    Returns:
+    str: The path to a WAV file containing the isolated stem at the original sample rate
+         and channel count.
+
+    Raises:
+    ValueError: If the stem is not one of the model's sources.
+    """
+    cache_file = os.path.join(STEMS_DIR, f"{audio_hash(audio_file)}_{SEPARATION_MODEL}_{stem}.wav")
+    if os.path.exists(cache_file):
+        logger.info(f"Using cached '{stem}' stem: {cache_file}")
+        return cache_file
+
+    model = load_separation_model()
+    if stem not in model.sources:
+        raise ValueError(f"Unknown stem '{stem}', expected one of {model.sources}")
+
+    wav, sr = torchaudio.load(audio_file)
+    mix = convert_audio(wav, sr, model.samplerate, model.audio_channels)
+
+    # Normalize the whole mix once so every chunk sees the same scale
+    ref = mix.mean(0)
+    mean, std = ref.mean(), ref.std() + 1e-8
+    mix = (mix - mean) / std
+
+    # Split the CPU between the workers instead of letting each one use every core.
+    # The thread count is process-wide, so hold the lock that MusicGen generation
+    # also takes to keep other sessions from running with the reduced count.
+    with TORCH_THREADS_LOCK:
+        num_threads = torch.get_num_threads()
+        torch.set_num_threads(max(1, num_threads // SEPARATION_WORKERS))
+        try:
+            logger.info(f"Separating '{stem}' stem from {audio_file}")
+            separated = separate_chunked(model, mix, model.sources.index(stem))
+        finally:
+            torch.set_num_threads(num_threads)
+
+    separated = separated * std + mean
+    stem_audio = convert_audio(separated, model.samplerate, sr, wav.shape[0])
+
+    os.makedirs(STEMS_DIR, exist_ok=True)
+    tmp_file = f"{cache_file}.tmp"
+    torchaudio.save(tmp_file, stem_audio, sr, format='wav')
+    os.replace(tmp_file, cache_file)
+    return cache_file
@@ -1,8 +1,12 @@
 import base64
 import os
+import threading
 import numpy as np
 from .config import NOTE_NAMES
 
+# Serializes torch work that changes or depends on the process-wide intra-op thread count
+TORCH_THREADS_LOCK = threading.Lock()
+
 def get_binary_file_downloader_html(bin_file: str, file_label: str = 'File') -> str:
     """
     Generates an HTML link for downloading a binary file.
@@ -1,4 +1,5 @@
 import os
+import time
 import numpy as np
 import logging
 import matplotlib.pyplot as plt
@@ -152,19 +153,21 @@ def clear_frames_directory(frames_dir):
             except Exception as e:
                 logger.error(f"Failed to delete {file_path}. Reason: {e}")
 
-def generate_video():
+def generate_video(stem: str = None):
     """
     Generates a video visualization of an audio file using FFT (Fast Fourier Transform) analysis.
     This function reads an audio file, performs FFT on segments of the audio to extract frequency
     information, and generates frames for a video visualization. The frames are then combined with
     the audio to produce a video file.
     Steps:
-    1. Read the audio file and calculate necessary parameters.
-    2. Perform a first pass to determine the maximum amplitude for normalization.
-    3. Perform a second pass to generate frames for the video.
-    4. Combine the frames and audio into a video using FFmpeg.
+    1. Optionally isolate a single stem so the FFT only sees the target instrument.
+    2. Read the audio file and calculate necessary parameters.
+    3. Perform a first pass to determine the maximum amplitude for normalization.
+    4. Perform a second pass to generate frames for the video.
+    5. Combine the frames and the original audio into a video using FFmpeg.
     Parameters:
-    None
+    stem (str): The stem to isolate before the FFT analysis (e.g. 'other' for piano).
+                Default is None, which analyzes the full mix.
     Returns:
     None
     Raises:
@@ -175,7 +178,15 @@ def generate_video():
     - The function assumes the existence of helper functions: extract_sample, find_top_notes, and plot_fft.
     - FFmpeg must be installed and available in the system's PATH.
     """
-    fs, audio = wavfile.read(AUDIO_FILE)
+    start = time.perf_counter()
+    analysis_file = AUDIO_FILE
+    if stem:
+        # Imported here so the default full-mix path does not load demucs
+        from .separator import separate_stem
+        analysis_file = separate_stem(stem, AUDIO_FILE)
+        logger.info(f"Stem separation took {time.perf_counter() - start:.1f}s")
+
+    fs, audio = wavfile.read(analysis_file)
     
     audio_length = len(audio)/fs
     frame_count = int(audio_length*FPS)
@@ -217,4 +228,6 @@ def generate_video():
         logger.info("FFmpeg Output: %s", result.stdout)
     except subprocess.CalledProcessError as e:
         logger.error("Error running FFmpeg: %s", e)
-        logger.error("FFmpeg Error Output: %s", e.stderr)
\ No newline at end of file
+        logger.error("FFmpeg Error Output: %s", e.stderr)
+
+    logger.info(f"Video generation took {time.perf_counter() - start:.1f}s")
\ No newline at end of file
@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+import pytest
+import torch
+from src import separator
+
+# 2 s chunks at 100 Hz with the default 1 s overlap: chunk 200, overlap 100, stride 100
+MODEL = SimpleNamespace(samplerate=100, max_allowed_segment=2.0)
+
+@pytest.mark.parametrize("length", [
+    50,    # shorter than the overlap
+    1000,  # exact multiple of the stride
+    1037,  # short final chunk
+])
+def test_separate_chunked_identity(monkeypatch, length):
+    monkeypatch.setattr(separator, 'separate_chunk', lambda model, chunk, source_index: chunk)
+    mix = torch.randn(2, length)
+
+    out = separator.separate_chunked(MODEL, mix, 0)
+
+    assert out.shape == mix.shape
+    assert torch.allclose(out, mix, atol=1e-6)